@@ -1,5 +1,6 @@
+import json
 from enum import Enum
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 # 標準PythonのEnumクラスを継承して飲み物の種類を事前定義
 class DrinkType(str, Enum):
@@ -16,9 +17,13 @@ app = FastAPI()
 async def read_item(item_id):
     return {"item_id": item_id}
 
+# 常に同じ内容を返すエンドポイントは、JSONバイト列を起動時に1回だけ作成しておく
+## リクエストごとのjsonable_encoder・JSONエンコード処理を省略できる
+_USER_ME_BYTES = json.dumps({"user_id": "the current user"}, separators=(",", ":")).encode()
+
 @app.get("/users/me")
 async def read_user_me():
-    return {"user_id": "the current user"}
+    return Response(content=_USER_ME_BYTES, media_type="application/json")
 
 # パスパラメータのタイプを指定（文字列）
 @app.get("/users/{user_id}")
@@ -29,15 +34,25 @@ async def read_user(user_id: str):
 
 # Enumを使用したパスパラメータの例
 ## 事前定義した飲み物の種類に基づいて異なるレスポンスを返す
+## Enumメンバーをキーにした辞書を用意し、if文の連鎖ではなく1回の辞書ルックアップで分岐する
+_DRINK_MESSAGES: dict[DrinkType, str] = {
+    DrinkType.coffee: "Perfect for morning energy!",
+    DrinkType.tea: "Relaxing and healthy choice",
+    DrinkType.juice: "Fresh and vitamin-rich!",
+}
+
+# 飲み物の種類は3つだけなので、レスポンス全体のJSONバイト列も事前に作成できる
+_DRINK_RESPONSES: dict[DrinkType, bytes] = {
+    drink: json.dumps(
+        {"drink_type": drink.value, "message": message}, separators=(",", ":")
+    ).encode()
+    for drink, message in _DRINK_MESSAGES.items()
+}
+
 @app.get("/drinks/{drink_type}")
 async def get_drink(drink_type: DrinkType):
-    if drink_type is DrinkType.coffee:
-        return {"drink_type": drink_type, "message": "Perfect for morning energy!"}
-
-    if drink_type.value == "tea":
-        return {"drink_type": drink_type, "message": "Relaxing and healthy choice"}
-
-    return {"drink_type": drink_type, "message": "Fresh and vitamin-rich!"}
+    return Response(content=_DRINK_RESPONSES[drink_type], media_type="application/json")
+## Enumメンバーは `drink_type is DrinkType.coffee` や `drink_type.value == "tea"` のように比較することも可能
 
 # --------------------------------------------------
 # Enumとは？
@@ -49,11 +49,9 @@ async def read_user_item(item_id: str, needy: str):
 async def read_item_with_short(item_id: str, q: Union[str, None] = None, short: bool = False):
     item = {"item_id": item_id}
     if q:
-        item.update({"q": q})
+        item["q"] = q
     if not short:
-        item.update(
-            {"description": "This is an amazing item that has a long description"}
-        )
+        item["description"] = "This is an amazing item that has a long description"
     return item
 ## boolean型のクエリパラメータshortは、以下のいずれもTrueと解釈される
 ### /items3/foo?short=1
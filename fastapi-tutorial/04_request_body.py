@@ -13,9 +13,9 @@ app = FastAPI()
 # パスパラメータ、リクエストボディ、クエリパラメータを同時に指定することも可能
 @app.put("/items/{item_id}")
 async def update_item(item_id: int, item: Item, q: str | None = None):
-    result = {"item_id": item_id, **item.dict()}
+    result = {"item_id": item_id, **item.model_dump()}
     if q:
-        result.update({"q": q})
+        result["q"] = q
     return result
 ## パスに宣言されているitem_idはパスパラメータ
 ## データ型（int, float, str, boolなど）が指定されているqはクエリパラメータ
@@ -37,6 +37,7 @@ async def update_item(item_id: int, item: Item, q: str | None = None):
 
 ## シリアライゼーションを行うメソッドの例
 ### item = Item(name="Laptop", price=999.99)
-### item.dict()  → {'name': 'Laptop', 'price': 999.99, 'description': None, 'tax': None}
-### item.json()  → '{"name": "Laptop", "price": 999.99, "description": null, "tax": null}'
+### item.model_dump()       → {'name': 'Laptop', 'price': 999.99, 'description': None, 'tax': None}
+### item.model_dump_json()  → '{"name": "Laptop", "price": 999.99, "description": null, "tax": null}'
+### ※ .dict() / .json() はPydantic v1の名前で、v2では非推奨（呼び出すたびに警告処理が走る）
 # --------------------------------------------------
\ No newline at end of file
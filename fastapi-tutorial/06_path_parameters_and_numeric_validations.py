@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Annotated, Union
 from fastapi import FastAPI, Path, Query
 
 app = FastAPI()
@@ -17,8 +17,8 @@ app = FastAPI()
 # パスパラメータとメタデータの基本例
 @app.get("/items/{item_id}")
 async def read_items_with_metadata(
-    item_id: int = Path(title="取得するアイテムのID"),
-    q: Union[str, None] = Query(default=None, alias="item-query"),
+    item_id: Annotated[int, Path(title="取得するアイテムのID")],
+    q: Annotated[Union[str, None], Query(alias="item-query")] = None,
 ):
     """
     item_idというパラメータにメタデータを設定
@@ -26,7 +26,7 @@ async def read_items_with_metadata(
     """
     results = {"item_id": item_id}
     if q:
-        results.update({"q": q})
+        results["q"] = q
     return results
 
 
@@ -66,6 +66,15 @@ async def read_item_keyword_only(*, item_id: int = Path(title="アイテムID"),
     return {"item_id": item_id, "q": q}
 
 
+# ✅ 参考: Annotatedを使用する方法（推奨）
+## Path()やQuery()を型注釈側（Annotated）に書けば、デフォルト値として扱われないため順序の問題は発生しない
+## FastAPIはAnnotated内のPath()/Query()をコピーして使うため、型エイリアスとして複数のエンドポイントで共有することも可能
+##   ItemIdPath = Annotated[int, Path(title="アイテムID")]
+##   async def read_item(item_id: ItemIdPath, q: str): ...
+## ※ デフォルト値として渡す Path() はFastAPIがエンドポイントごとに書き換えるため、共有せず毎回書く
+## 以降の例はAnnotatedを使用する
+
+
 # --------------------------------------------------
 # 数値検証
 ## item_idを1以上の数に制限したい場合、ge（greater equal）を設定可能
@@ -75,7 +84,7 @@ async def read_item_keyword_only(*, item_id: int = Path(title="アイテムID"),
 @app.get("/validated-items/{item_id}")
 async def read_validated_items(
     *, 
-    item_id: int = Path(title="取得するアイテムのID", ge=1), 
+    item_id: Annotated[int, Path(title="取得するアイテムのID", ge=1)], 
     q: str
 ):
     """
@@ -84,7 +93,7 @@ async def read_validated_items(
     """
     results = {"item_id": item_id}
     if q:
-        results.update({"q": q})
+        results["q"] = q
     return results
 
 
@@ -92,18 +101,18 @@ async def read_validated_items(
 @app.get("/advanced-items/{item_id}")
 async def read_advanced_items(
     *,
-    item_id: int = Path(
+    item_id: Annotated[int, Path(
         title="アイテムID",
         description="1以上1000以下のアイテムID",
         ge=1,
         le=1000
-    ),
-    size: float = Query(
+    )],
+    size: Annotated[float, Query(
         title="サイズ",
         description="0より大きく100未満のサイズ",
         gt=0,
         lt=100
-    )
+    )]
 ):
     """
     複数の数値検証キーワード：
@@ -125,24 +134,22 @@ async def read_advanced_items(
 @app.get("/products/{category_id}")
 async def get_products_by_category(
     *,
-    category_id: int = Path(
+    category_id: Annotated[int, Path(
         title="カテゴリID", 
         description="商品カテゴリのID（1以上）",
         ge=1
-    ),
-    page: int = Query(
-        default=1,
+    )],
+    page: Annotated[int, Query(
         title="ページ番号",
         description="表示するページ番号（1以上）",
         ge=1
-    ),
-    per_page: int = Query(
-        default=10,
+    )] = 1,
+    per_page: Annotated[int, Query(
         title="1ページあたりの件数",
         description="1ページに表示する商品数（1以上100以下）",
         ge=1,
         le=100
-    )
+    )] = 10
 ):
     """
     実用的なページネーション例
@@ -12,10 +12,12 @@ app = FastAPI()
 # --------------------------------------------------
 
 class FilterParams(BaseModel):
+    model_config = {"frozen": True}
+
     limit: int = Field(100, gt=0, le=100)
     offset: int = Field(0, ge=0)
     order_by: Literal["created_at", "updated_at"] = "created_at"
-    tags: list[str] = []
+    tags: tuple[str, ...] = ()
 
 
 @app.get("/items/")
@@ -26,6 +28,8 @@ async def read_items_with_filter(filter_query: Annotated[FilterParams, Query()])
     }
 # クエリパラメータをPydanticモデルで管理
 ## /docsでlimit、offset、order_by、tagsの4つのパラメータが表示される
+## frozen=True（変更不可）のモデルにし、tagsのデフォルト値をlistではなくtupleにすることで
+## リクエストごとに可変なデフォルト値（[]）をコピーする処理を省略できる
 
 # Annotatedの説明：
 ## - タイプヒント機能で、タイプに追加情報（メタデータ）を添付
@@ -43,12 +47,12 @@ async def read_items_with_filter(filter_query: Annotated[FilterParams, Query()])
 # --------------------------------------------------
 
 class StrictFilterParams(BaseModel):
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "frozen": True}
 
     limit: int = Field(100, gt=0, le=100)
     offset: int = Field(0, ge=0)
     order_by: Literal["created_at", "updated_at"] = "created_at"
-    tags: list[str] = []
+    tags: tuple[str, ...] = ()
 
 
 @app.get("/strict-items/")
@@ -63,6 +67,8 @@ async def read_strict_items(filter_query: Annotated[StrictFilterParams, Query()]
 
 
 class ProductSearchParams(BaseModel):
+    model_config = {"frozen": True}
+
     category: str = Field("all", description="商品カテゴリ")
     min_price: int = Field(0, ge=0, description="最低価格")
     max_price: int = Field(10000, ge=0, le=100000, description="最高価格")
@@ -72,31 +78,50 @@ class ProductSearchParams(BaseModel):
     per_page: int = Field(20, ge=1, le=100, description="1ページあたりの件数")
 
 
+class ProductSearchResponse(BaseModel):
+    search_conditions: ProductSearchParams
+    results: str
+    pagination: str
+
+
 @app.get("/products/search/")
-async def search_products(search_params: Annotated[ProductSearchParams, Query()]):
-    return {
-        "search_conditions": search_params,
-        "results": f"カテゴリ'{search_params.category}'で価格{search_params.min_price}円〜{search_params.max_price}円の商品を検索",
-        "pagination": f"ページ{search_params.page}（{search_params.per_page}件表示）"
-    }
+async def search_products(search_params: Annotated[ProductSearchParams, Query()]) -> ProductSearchResponse:
+    return ProductSearchResponse(
+        search_conditions=search_params,
+        results=f"カテゴリ'{search_params.category}'で価格{search_params.min_price}円〜{search_params.max_price}円の商品を検索",
+        pagination=f"ページ{search_params.page}（{search_params.per_page}件表示）",
+    )
 # 実用的な商品検索API
 # 複数の検索条件をPydanticモデルで管理
+## レスポンスもモデルにして戻り値の型を宣言すると、dictをjsonable_encoderで辿る処理を省略し
+## pydantic-core（Rust実装）が直接JSONバイト列にシリアライズする
 
 
 class DateRange(BaseModel):
+    model_config = {"frozen": True}
+
     start_date: str = Field("2024-01-01", description="開始日（YYYY-MM-DD）")
     end_date: str = Field("2024-12-31", description="終了日（YYYY-MM-DD）")
 
+# 変更不可のモデルなので、デフォルト値のインスタンスを1つだけ作成して共有する
+_DEFAULT_DATE_RANGE = DateRange()
+
 class AdvancedFilterParams(BaseModel):
+    model_config = {"frozen": True}
+
     basic_filter: str = Field("", description="基本検索キーワード")
-    date_range: DateRange = DateRange()
-    status: list[Literal["active", "inactive", "pending"]] = ["active"]
+    date_range: DateRange = Field(default=_DEFAULT_DATE_RANGE)
+    status: tuple[Literal["active", "inactive", "pending"], ...] = ("active",)
+
+class AdvancedSearchResponse(BaseModel):
+    advanced_filters: AdvancedFilterParams
+    message: str
 
 @app.get("/advanced-search/")
-async def advanced_search(filters: Annotated[AdvancedFilterParams, Query()]):
-    return {
-        "advanced_filters": filters,
-        "message": "高度な検索条件が適用されました"
-    }
+async def advanced_search(filters: Annotated[AdvancedFilterParams, Query()]) -> AdvancedSearchResponse:
+    return AdvancedSearchResponse(
+        advanced_filters=filters,
+        message="高度な検索条件が適用されました",
+    )
 # ネストしたモデルを使用した高度な検索
 # 注意：ネストしたオブジェクトはクエリパラメータでは制限がある
\ No newline at end of file
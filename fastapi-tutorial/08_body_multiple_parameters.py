@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Annotated
 from fastapi import FastAPI, Path, Body
 from pydantic import BaseModel
 
@@ -13,28 +13,28 @@ app = FastAPI()
 
 class Item(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
-    tax: Union[float, None] = None
+    tax: float | None = None
 
 class User(BaseModel):
     username: str
-    full_name: Union[str, None] = None
+    full_name: str | None = None
 
 
 # Path、Query、リクエストボディの混合例
 @app.put("/items/{item_id}")
 async def update_item_mixed(
     *,
-    item_id: int = Path(title="取得するアイテムのID", ge=0, le=1000),
-    q: Union[str, None] = None,
-    item: Union[Item, None] = None,
+    item_id: Annotated[int, Path(title="取得するアイテムのID", ge=0, le=1000)],
+    q: str | None = None,
+    item: Item | None = None,
 ):
     results = {"item_id": item_id}
     if q:
-        results.update({"q": q})
+        results["q"] = q
     if item:
-        results.update({"item": item})
+        results["item"] = item
     return results
 # Path、Query、リクエストボディの混合使用例
 ## item_id: パスパラメータ（URL経路の一部）
@@ -69,7 +69,7 @@ async def update_order_with_importance(
     order_id: int, 
     item: Item, 
     user: User, 
-    importance: int = Body()
+    importance: Annotated[int, Body()]
 ):
     results = {
         "order_id": order_id, 
@@ -111,7 +111,7 @@ async def update_book_normal(book_id: int, item: Item):
 
 # embed=True使用
 @app.put("/magazines/{magazine_id}")
-async def update_magazine_embedded(magazine_id: int, item: Item = Body(embed=True)):
+async def update_magazine_embedded(magazine_id: int, item: Annotated[Item, Body(embed=True)]):
     return {"magazine_id": magazine_id, "item": item}
 # embed=True使用例
 # 予想されるボディ：
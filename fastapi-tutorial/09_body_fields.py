@@ -1,6 +1,6 @@
 from fastapi import Body, FastAPI
 from pydantic import BaseModel, Field
-from typing import Union
+from typing import Annotated
 
 app = FastAPI()
 
@@ -11,13 +11,15 @@ app = FastAPI()
 
 from pydantic import Field
 
+# 制約付きの型をAnnotatedで1回だけ定義し、複数のモデルから再利用できる
+_Description = Annotated[str | None, Field(title="アイテムの説明", max_length=300)]
+_Price = Annotated[float, Field(gt=0, description="価格は0より大きい値である必要があります")]
+
 class ItemWithField(BaseModel):
     name: str
-    description: Union[str, None] = Field(
-        default=None, title="アイテムの説明", max_length=300
-    )
-    price: float = Field(gt=0, description="価格は0より大きい値である必要があります")
-    tax: Union[float, None] = None
+    description: _Description = None
+    price: _Price
+    tax: float | None = None
 
 
 @app.put("/items-with-field/{item_id}")
@@ -27,6 +29,9 @@ async def update_item_with_field(item_id: int, item: ItemWithField = Body(embed=
 ## description: max_length=300で最大文字数制限
 ## price: gt=0で0より大きい値のみ許可
 ## title, descriptionでSwagger UIに表示される情報を設定
+## _Description, _Price のように型エイリアスにしておくと、同じ制約を他のモデルでもそのまま使える
+### FieldInfoオブジェクトもモジュール読み込み時に1回だけ作られる
+### 書き方は description: str | None = Field(default=None, title=..., max_length=300) と同じ意味
 
 # Fieldで使用可能な検証オプション：
 ## gt, ge, lt, le: 数値の範囲制限
@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from pydantic import BaseModel, HttpUrl, EmailStr, Field
-from typing import Union, List, Set, Dict
+from typing import List, Set, Dict
 
 app = FastAPI()
 
@@ -12,44 +12,48 @@ app = FastAPI()
 # 1. リストタイプの基本使用
 class ItemBasic(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
-    tax: Union[float, None] = None
-    tags: list = []  # サブタイプなしのリスト（すべてのタイプを許可）
+    tax: float | None = None
+    tags: list = Field(default_factory=list)  # サブタイプなしのリスト（すべてのタイプを許可）
 
 @app.put("/items-basic/{item_id}")
 async def update_item_basic(item_id: int, item: ItemBasic):
     results = {"item_id": item_id, "item": item}
     return results
-# tags: list = [] はリストタイプだが、要素のタイプは指定していない
+# tags: list はリストタイプだが、要素のタイプは指定していない
 # つまり文字列、数値、booleanなど、すべてのタイプを許可
 # 例: "tags": ["電子製品", "コンピュータ", 123, true]
+# デフォルト値に [] や set() を直接書くと、Pydanticはインスタンス生成のたびにそれをdeepcopyする
+## Field(default_factory=list) なら毎回 list() を呼ぶだけで済み、モデル生成が大幅に速くなる
 
 
 # 2. タイプを指定したリスト
 class ItemWithTypedList(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
-    tags: List[str] = []  # 文字列のみを含むリスト
+    tags: List[str] = Field(default_factory=list)  # 文字列のみを含むリスト
 
 @app.put("/items-typed/{item_id}")
 async def update_item_typed(item_id: int, item: ItemWithTypedList):
     return {"item_id": item_id, "item": item}
-# tags: List[str] = [] は文字列のみを要素として持つリスト
+# tags: List[str] は文字列のみを要素として持つリスト
 
 
 # 3. Setタイプ（重複を許可しない）
 class ItemWithSet(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
-    tags: Set[str] = set()  # 重複しない文字列の集合
+    tags: Set[str] = Field(default_factory=set)  # 重複しない文字列の集合
 
 @app.put("/items-set/{item_id}")
 async def update_item_set(item_id: int, item: ItemWithSet):
     return {"item_id": item_id, "item": item}
-# Set[str] = set() : 重複データがあるリクエストを受信しても、ユニークな項目の集合に自動変換
+# Set[str] : 重複データがあるリクエストを受信しても、ユニークな項目の集合に自動変換
+## 重複除去はpydantic-core（Rust実装）の中で行われるため、Python側のバリデータで除去するより速い
+## ただしsetは順序を保持しない。順序が必要なら List[str] + dict.fromkeys() で重複除去する（その分遅くなる）
 
 
 # 4. ネストされたモデル（サブモデル）
@@ -59,10 +63,10 @@ class Image(BaseModel):
 
 class ItemWithImage(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
-    tags: Set[str] = set()
-    image: Union[Image, None] = None  # Imageモデルをタイプとして使用
+    tags: Set[str] = Field(default_factory=set)
+    image: Image | None = None  # Imageモデルをタイプとして使用
 
 @app.put("/items-nested/{item_id}")
 async def update_item_nested(item_id: int, item: ItemWithImage):
@@ -88,7 +92,7 @@ class ImageWithValidation(BaseModel):
 class ItemWithValidatedImage(BaseModel):
     name: str
     price: float
-    image: Union[ImageWithValidation, None] = None
+    image: ImageWithValidation | None = None
 
 @app.put("/items-validated/{item_id}")
 async def update_item_validated(item_id: int, item: ItemWithValidatedImage):
@@ -101,9 +105,9 @@ async def update_item_validated(item_id: int, item: ItemWithValidatedImage):
 # 6. サブモデルのリスト
 class ItemWithImageList(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
-    images: Union[List[ImageWithValidation], None] = None  # Imageモデルのリスト
+    images: List[ImageWithValidation] | None = None  # Imageモデルのリスト
 
 @app.put("/items-images/{item_id}")
 async def update_item_images(item_id: int, item: ItemWithImageList):
@@ -122,12 +126,12 @@ async def update_item_images(item_id: int, item: ItemWithImageList):
 # 7. 深くネストされたモデル
 class Offer(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
     items: List[ItemWithImageList]  # ItemリストでImageリストを含む
 
 @app.post("/offers/")
-async def create_offer(offer: Offer):
+async def create_offer(offer: Offer) -> Offer:
     return offer
 # モデルの中にモデル、その中にまたモデル...の形で無限にネスト可能
 # 構造:
@@ -145,11 +149,13 @@ class ContactInfo(BaseModel):
 class Product(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     price: float = Field(gt=0, description="価格は0より大きい必要があります")
-    contacts: List[ContactInfo] = []  # ネストされたモデルのリスト
+    contacts: List[ContactInfo] = Field(default_factory=list)  # ネストされたモデルのリスト
 
 @app.post("/products/")
-async def create_product(product: Product):
+async def create_product(product: Product) -> Product:
     return product
+# 戻り値の型（-> Product）を宣言すると、FastAPIはjsonable_encoderを通さず
+# Pydantic（Rust実装のpydantic-core）で直接JSONバイト列にシリアライズする
 # 複雑なデータ構造でもタイプ安全性 + 自動検証 + ドキュメント化が可能
 # リクエストボディ例:
 # {
@@ -175,8 +181,11 @@ async def create_product(product: Product):
 
 # 9. 純粋なリストのボディ
 @app.post("/images/multiple/")
-async def create_multiple_images(images: List[ImageWithValidation]):
+async def create_multiple_images(images: List[ImageWithValidation]) -> List[ImageWithValidation]:
     return images
+# 受け取ったモデルをそのまま返すだけの場合も、戻り値の型を宣言しておけばよい
+## 返り値が既に検証済みのモデルインスタンスなので、再検証はisinstanceの確認だけで済む
+## jsonable_encoderで要素を1つずつ辿る処理も発生しない
 # リクエストボディ自体が配列の場合、Pydanticモデルのリストを直接受け取れる
 # リクエストボディ例:
 # [
@@ -189,7 +198,7 @@ async def create_multiple_images(images: List[ImageWithValidation]):
 
 # 10. 任意のdictボディ
 @app.post("/index-weights/")
-async def create_index_weights(weights: Dict[int, float]):
+async def create_index_weights(weights: Dict[int, float]) -> Dict[int, float]:
     return weights
 # キーと値のタイプのみ指定し、具体的なフィールド名を事前に定義する必要がない
 # リクエストボディ例:
@@ -202,6 +211,8 @@ async def create_index_weights(weights: Dict[int, float]):
 ## JSONのキーは常に文字列 ("0", "1", "2")
 ## Pydanticが自動的にintに変換 (0, 1, 2)
 ## 最終結果: {0: 0.5, 1: 1.2, 2: 0.8}
+## キーの変換はpydantic-core（Rust実装）の中で行われるため、Python側でループを書く必要はない
+## 戻り値の型も宣言しておくと、レスポンスもjsonable_encoderでキーを1つずつ処理せずに直接JSON化される
 
 # いつ使用するか？
 ## 動的なキーを受け取る必要がある場合（事前にフィールド名が分からない場合）
@@ -1,6 +1,6 @@
 from fastapi import Body, FastAPI
 from pydantic import BaseModel, Field
-from typing import Annotated, Union
+from typing import Annotated
 
 app = FastAPI()
 
@@ -9,23 +9,34 @@ app = FastAPI()
 ## アプリが受け取るデータの例を宣言可能
 # --------------------------------------------------
 
+# 複数の箇所で使う例データ
+## モジュールレベルで1回だけ作成し、各モデル・エンドポイントで同じオブジェクトを参照する
+_ITEM_EXAMPLE_FOO = {
+    "name": "Foo",
+    "description": "A very nice Item",
+    "price": 35.4,
+    "tax": 3.2,
+}
+_ITEM_EXAMPLE_BAR = {
+    "name": "Bar",
+    "price": "35.4",
+}
+_ITEM_EXAMPLE_BAZ = {
+    "name": "Baz",
+    "price": "thirty five point four",
+}
+
+
 # 1. Pydanticモデル内の追加JSONスキーマデータ
 class ItemWithModelConfig(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
-    tax: Union[float, None] = None
+    tax: float | None = None
 
     model_config = {
         "json_schema_extra": {
-            "examples": [
-                {
-                    "name": "Foo",
-                    "description": "A very nice Item",
-                    "price": 35.4,
-                    "tax": 3.2,
-                }
-            ]
+            "examples": [_ITEM_EXAMPLE_FOO]
         }
     }
 
@@ -41,9 +52,9 @@ async def update_item_model_config(item_id: int, item: ItemWithModelConfig):
 # 2. Fieldの追加引数
 class ItemWithFieldExamples(BaseModel):
     name: str = Field(examples=["Foo"])
-    description: Union[str, None] = Field(default=None, examples=["A very nice Item"])
+    description: str | None = Field(default=None, examples=["A very nice Item"])
     price: float = Field(examples=[35.4])
-    tax: Union[float, None] = Field(default=None, examples=[3.2])
+    tax: float | None = Field(default=None, examples=[3.2])
 
 @app.put("/items-field-examples/{item_id}")
 async def update_item_field_examples(item_id: int, item: ItemWithFieldExamples):
@@ -55,9 +66,9 @@ async def update_item_field_examples(item_id: int, item: ItemWithFieldExamples):
 # 3. Bodyにexamplesを含める
 class ItemBasic(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
-    tax: Union[float, None] = None
+    tax: float | None = None
 
 @app.put("/items-body-examples/{item_id}")
 async def update_item_body_examples(
@@ -65,14 +76,7 @@ async def update_item_body_examples(
     item: Annotated[
         ItemBasic,
         Body(
-            examples=[
-                {
-                    "name": "Foo",
-                    "description": "A very nice Item",
-                    "price": 35.4,
-                    "tax": 3.2,
-                }
-            ],
+            examples=[_ITEM_EXAMPLE_FOO],
         ),
     ],
 ):
@@ -90,22 +94,7 @@ async def update_item_multiple_examples(
     item: Annotated[
         ItemBasic,
         Body(
-            examples=[
-                {
-                    "name": "Foo",
-                    "description": "A very nice Item",
-                    "price": 35.4,
-                    "tax": 3.2,
-                },
-                {
-                    "name": "Bar",
-                    "price": "35.4",
-                },
-                {
-                    "name": "Baz",
-                    "price": "thirty five point four",
-                },
-            ],
+            examples=[_ITEM_EXAMPLE_FOO, _ITEM_EXAMPLE_BAR, _ITEM_EXAMPLE_BAZ],
         ),
     ],
 ):
@@ -117,6 +106,23 @@ async def update_item_multiple_examples(
 
 
 # 5. OpenAPI特化のexamples (openapi_examples)
+_ITEM_OPENAPI_EXAMPLES = {
+    "normal": {
+        "summary": "通常の例",
+        "description": "**正常な**アイテムは正しく動作します。",
+        "value": _ITEM_EXAMPLE_FOO,
+    },
+    "converted": {
+        "summary": "変換されたデータの例",
+        "description": "FastAPIは価格の`文字列`を自動的に実際の`数値`に変換できます",
+        "value": _ITEM_EXAMPLE_BAR,
+    },
+    "invalid": {
+        "summary": "無効なデータはエラーで拒否される",
+        "value": _ITEM_EXAMPLE_BAZ,
+    },
+}
+
 @app.put("/items-openapi-examples/{item_id}")
 async def update_item_openapi_examples(
     *,
@@ -124,33 +130,7 @@ async def update_item_openapi_examples(
     item: Annotated[
         ItemBasic,
         Body(
-            openapi_examples={
-                "normal": {
-                    "summary": "通常の例",
-                    "description": "**正常な**アイテムは正しく動作します。",
-                    "value": {
-                        "name": "Foo",
-                        "description": "A very nice Item",
-                        "price": 35.4,
-                        "tax": 3.2,
-                    },
-                },
-                "converted": {
-                    "summary": "変換されたデータの例",
-                    "description": "FastAPIは価格の`文字列`を自動的に実際の`数値`に変換できます",
-                    "value": {
-                        "name": "Bar",
-                        "price": "35.4",
-                    },
-                },
-                "invalid": {
-                    "summary": "無効なデータはエラーで拒否される",
-                    "value": {
-                        "name": "Baz",
-                        "price": "thirty five point four",
-                    },
-                },
-            },
+            openapi_examples=_ITEM_OPENAPI_EXAMPLES,
         ),
     ],
 ):
@@ -174,3 +154,8 @@ async def update_item_openapi_examples(
 ## 3. Body(examples=[]): リクエストボディに複数の例を設定（JSONスキーマ）
 ## 4. Body(openapi_examples={}): OpenAPI特化の例（Swagger UIで表示）
 # --------------------------------------------------
+
+
+
+# OpenAPIスキーマの事前生成（理由は17章末尾の説明を参照）
+app.openapi()
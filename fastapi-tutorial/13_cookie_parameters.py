@@ -1,4 +1,4 @@
-from typing import Annotated, Union
+from typing import Annotated
 from fastapi import Cookie, FastAPI
 
 app = FastAPI()
@@ -10,7 +10,7 @@ app = FastAPI()
 
 # 基本的なCookieパラメータの宣言
 @app.get("/items/")
-async def read_items(ads_id: Annotated[Union[str, None], Cookie()] = None):
+async def read_items(ads_id: Annotated[str | None, Cookie()] = None):
     return {"ads_id": ads_id}
 # Path と Query と同じ構造を使用
 # 最初の値はデフォルト値
@@ -32,8 +32,8 @@ async def read_items(ads_id: Annotated[Union[str, None], Cookie()] = None):
 # 複数のCookieパラメータ
 @app.get("/user-info/")
 async def read_user_info(
-    session_id: Annotated[Union[str, None], Cookie()] = None,
-    user_token: Annotated[Union[str, None], Cookie()] = None,
+    session_id: Annotated[str | None, Cookie()] = None,
+    user_token: Annotated[str | None, Cookie()] = None,
 ):
     return {
         "session_id": session_id,
@@ -44,7 +44,7 @@ async def read_user_info(
 # 検証付きCookieパラメータ
 @app.get("/analytics/")
 async def read_analytics(
-    tracking_id: Annotated[Union[str, None], Cookie(min_length=10, max_length=50)] = None,
+    tracking_id: Annotated[str | None, Cookie(min_length=10, max_length=50)] = None,
 ):
     return {"tracking_id": tracking_id}
 # Cookie にも Query や Path と同様に検証パラメータを追加可能
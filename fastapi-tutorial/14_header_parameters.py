@@ -1,4 +1,4 @@
-from typing import Annotated, Union, List
+from typing import Annotated, List
 from fastapi import FastAPI, Header
 
 app = FastAPI()
@@ -10,7 +10,7 @@ app = FastAPI()
 
 # 基本的なHeaderパラメータの宣言
 @app.get("/items/")
-async def read_items(user_agent: Annotated[Union[str, None], Header()] = None):
+async def read_items(user_agent: Annotated[str | None, Header()] = None):
     return {"User-Agent": user_agent}
 # Path, Query, Cookie を使用した同じ構造を利用してヘッダーパラメータを宣言
 # 最初の値はデフォルト値
@@ -37,8 +37,8 @@ async def read_items(user_agent: Annotated[Union[str, None], Header()] = None):
 # アンダースコアの自動変換例
 @app.get("/user-info/")
 async def read_user_info(
-    user_agent: Annotated[Union[str, None], Header()] = None,
-    accept_language: Annotated[Union[str, None], Header()] = None,
+    user_agent: Annotated[str | None, Header()] = None,
+    accept_language: Annotated[str | None, Header()] = None,
 ):
     return {
         "User-Agent": user_agent,
@@ -53,7 +53,7 @@ async def read_user_info(
 # 自動変換の無効化
 @app.get("/special-headers/")
 async def read_special_headers(
-    strange_header: Annotated[Union[str, None], Header(convert_underscores=False)] = None,
+    strange_header: Annotated[str | None, Header(convert_underscores=False)] = None,
 ):
     return {"strange_header": strange_header}
 # Header の convert_underscores パラメータを False に設定
@@ -67,7 +67,7 @@ async def read_special_headers(
 # --------------------------------------------------
 
 @app.get("/tokens/")
-async def read_tokens(x_token: Annotated[Union[List[str], None], Header()] = None):
+async def read_tokens(x_token: Annotated[List[str] | None, Header()] = None):
     return {"X-Token values": x_token}
 # 2回以上現れる可能性のある X-Token ヘッダーを宣言
 # リクエスト例:
@@ -84,10 +84,10 @@ async def read_tokens(x_token: Annotated[Union[List[str], None], Header()] = Non
 # 複数のヘッダーパラメータ
 @app.get("/request-info/")
 async def read_request_info(
-    host: Annotated[Union[str, None], Header()] = None,
-    user_agent: Annotated[Union[str, None], Header()] = None,
-    accept: Annotated[Union[str, None], Header()] = None,
-    accept_language: Annotated[Union[str, None], Header()] = None,
+    host: Annotated[str | None, Header()] = None,
+    user_agent: Annotated[str | None, Header()] = None,
+    accept: Annotated[str | None, Header()] = None,
+    accept_language: Annotated[str | None, Header()] = None,
 ):
     return {
         "Host": host,
@@ -1,4 +1,4 @@
-from typing import Annotated, Union
+from typing import Annotated
 from fastapi import Cookie, FastAPI
 from pydantic import BaseModel
 
@@ -21,8 +21,8 @@ app = FastAPI()
 
 class Cookies(BaseModel):
     session_id: str
-    fatebook_tracker: Union[str, None] = None
-    googall_tracker: Union[str, None] = None
+    fatebook_tracker: str | None = None
+    googall_tracker: str | None = None
 
 @app.get("/items/")
 async def read_items(cookies: Annotated[Cookies, Cookie()]):
@@ -49,7 +49,7 @@ async def read_items(cookies: Annotated[Cookies, Cookie()]):
 class UserCookies(BaseModel):
     user_id: str
     session_token: str
-    preferences: Union[str, None] = None
+    preferences: str | None = None
 
 @app.get("/user-profile/")
 async def read_user_profile(cookies: Annotated[UserCookies, Cookie()]):
@@ -71,8 +71,8 @@ class StrictCookies(BaseModel):
     model_config = {"extra": "forbid"}
 
     session_id: str
-    fatebook_tracker: Union[str, None] = None
-    googall_tracker: Union[str, None] = None
+    fatebook_tracker: str | None = None
+    googall_tracker: str | None = None
 
 @app.get("/strict-items/")
 async def read_strict_items(cookies: Annotated[StrictCookies, Cookie()]):
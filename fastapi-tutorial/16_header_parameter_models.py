@@ -1,4 +1,4 @@
-from typing import Annotated, Union, List
+from typing import Annotated, List
 from fastapi import FastAPI, Header
 from pydantic import BaseModel
 
@@ -21,8 +21,8 @@ app = FastAPI()
 class CommonHeaders(BaseModel):
     host: str
     save_data: bool
-    if_modified_since: Union[str, None] = None
-    traceparent: Union[str, None] = None
+    if_modified_since: str | None = None
+    traceparent: str | None = None
     x_tag: List[str] = []
 
 @app.get("/items/")
@@ -40,10 +40,10 @@ async def read_items(headers: Annotated[CommonHeaders, Header()]):
 
 # 複数のヘッダーフィールドを持つモデル
 class RequestHeaders(BaseModel):
-    user_agent: Union[str, None] = None
-    accept_language: Union[str, None] = None
-    accept_encoding: Union[str, None] = None
-    referer: Union[str, None] = None
+    user_agent: str | None = None
+    accept_language: str | None = None
+    accept_encoding: str | None = None
+    referer: str | None = None
 
 @app.get("/request-info/")
 async def read_request_info(headers: Annotated[RequestHeaders, Header()]):
@@ -66,8 +66,8 @@ class StrictHeaders(BaseModel):
 
     host: str
     save_data: bool
-    if_modified_since: Union[str, None] = None
-    traceparent: Union[str, None] = None
+    if_modified_since: str | None = None
+    traceparent: str | None = None
     x_tag: List[str] = []
 
 @app.get("/strict-items/")
@@ -90,8 +90,8 @@ async def read_strict_items(headers: Annotated[StrictHeaders, Header()]):
 # カスタム検証を含むヘッダーモデル
 class AuthHeaders(BaseModel):
     authorization: str
-    x_api_key: Union[str, None] = None
-    x_request_id: Union[str, None] = None
+    x_api_key: str | None = None
+    x_request_id: str | None = None
 
 @app.get("/protected/")
 async def read_protected(headers: Annotated[AuthHeaders, Header()]):
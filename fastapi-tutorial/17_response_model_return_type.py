@@ -1,6 +1,6 @@
-from typing import Any, List, Union
+from typing import Annotated, Any, List
 from fastapi import FastAPI
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, WithJsonSchema
 
 app = FastAPI()
 
@@ -17,9 +17,9 @@ app = FastAPI()
 # 1. 基本的なレスポンスモデルの使用
 class Product(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
-    tax: Union[float, None] = None
+    tax: float | None = None
     tags: List[str] = []
 
 # response_modelパラメータで応答構造を定義
@@ -39,17 +39,23 @@ async def read_products() -> Any:
 
 
 # 2. 入力と出力モデルの分離（セキュリティ重要）
+# 応答用のメールアドレス型
+## EmailStrの検証（email-validator）は1件あたり数十μsかかる
+## 応答のデータは入力時に検証済み（またはDBから取得）なので、応答モデルではstrとして扱い再検証を省略する
+## WithJsonSchemaでOpenAPI上は EmailStr と同じ {"type": "string", "format": "email"} として表示
+_ResponseEmail = Annotated[str, WithJsonSchema({"type": "string", "format": "email"})]
+
 class UserInput(BaseModel):
     username: str
     password: str  # 入力時には必要
     email: EmailStr
-    full_name: Union[str, None] = None
+    full_name: str | None = None
 
 class UserOutput(BaseModel):
     username: str
     # password フィールドなし！ → セキュリティのため出力から除外
-    email: EmailStr
-    full_name: Union[str, None] = None
+    email: _ResponseEmail  # 入力（UserInput）はEmailStrで検証済み
+    full_name: str | None = None
 
 # 入力にはパスワードが含まれるが、出力からは自動的に除外される
 @app.post("/users/", response_model=UserOutput)
@@ -62,7 +68,7 @@ async def create_user(user: UserInput) -> Any:
 # 3. レスポンスモデルエンコーディングパラメータ
 class ItemModel(BaseModel):
     name: str
-    description: Union[str, None] = None  # デフォルト値: None
+    description: str | None = None  # デフォルト値: None
     price: float
     tax: float = 10.5  # デフォルト値: 10.5
     tags: List[str] = []  # デフォルト値: 空のリスト
@@ -102,22 +108,23 @@ async def read_item_public_info(item_id: str):
 # 例：{"name": "Bar", "description": "The bartenders", "price": 62, "tags": []}
 
 
-# 6. リストを使った包含/除外（setに自動変換される）
+# 6. 包含/除外はsetで指定する（リストも可能）
 @app.get(
     "/items/{item_id}/basic",
     response_model=ItemModel,
-    response_model_include=["name", "price"],  # リストでも指定可能（内部でsetに変換）
+    response_model_include={"name", "price"},  # ["name", "price"] のようにリストでも指定可能
 )
 async def read_item_basic_info(item_id: str):
     return items_data[item_id]
-# FastAPIが自動的に list を set に変換して処理
+# リストで指定した場合、応答のたびにPydantic側で set に変換してから処理される
+## 最初からsetで書いておけば、その変換が不要になる（frozensetも内部で変換されるため、setが最速）
 # 基本情報（名前と価格）のみ応答
 
 
 # 7. 複雑な例：条件付きレスポンスモデル
 class AdminItemModel(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
     tax: float = 10.5
     tags: List[str] = []
@@ -126,21 +133,20 @@ class AdminItemModel(BaseModel):
 
 class PublicItemModel(BaseModel):
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
     tags: List[str] = []
     # tax, internal_code, cost フィールドなし
 
+# 管理者専用の追加情報（実際の実装ではDBから取得）
+_ADMIN_EXTRA_FIELDS = {"internal_code": "INT-001", "cost": 25.0}
+
 # 管理者用エンドポイント（すべての情報）
 @app.get("/admin/items/{item_id}", response_model=AdminItemModel)
 async def read_admin_item(item_id: str):
     # 実際の実装では認証チェックが必要
-    admin_data = {
-        **items_data.get(item_id, {}),
-        "internal_code": "INT-001",
-        "cost": 25.0
-    }
-    return admin_data
+    # | 演算子（Python 3.9+）で2つのdictを1回でマージ（左右の内容はどちらも変更されない）
+    return items_data[item_id] | _ADMIN_EXTRA_FIELDS
 
 # 一般ユーザー用エンドポイント（公開情報のみ）
 @app.get("/public/items/{item_id}", response_model=PublicItemModel)
@@ -176,13 +182,13 @@ class UserCreate(BaseModel):
     username: str
     email: EmailStr
     password: str
-    full_name: Union[str, None] = None
+    full_name: str | None = None
 
 class UserResponse(BaseModel):
     id: int
     username: str
-    email: EmailStr
-    full_name: Union[str, None] = None
+    email: _ResponseEmail
+    full_name: str | None = None
     is_active: bool = True
     created_at: str
     # password は含まれない！
@@ -208,23 +214,29 @@ async def create_user_account(user: UserCreate) -> Any:
     }
 
 # ユーザーリスト（ページネーション付き）
+users_data = [
+    {
+        "id": 1,
+        "username": "john_doe",
+        "email": "john@example.com",
+        "full_name": "John Doe",
+        "is_active": True,
+        "created_at": "2024-01-01T00:00:00Z"
+    }
+]
+
 @app.get("/users/", response_model=UserList)
 async def get_users_list() -> Any:
-    return {
-        "users": [
-            {
-                "id": 1,
-                "username": "john_doe",
-                "email": "john@example.com",
-                "full_name": "John Doe",
-                "is_active": True,
-                "created_at": "2024-01-01T00:00:00Z"
-            }
-        ],
-        "total": 1,
-        "page": 1,
-        "per_page": 10
-    }
+    return UserList.model_construct(
+        users=[UserResponse.model_construct(**row) for row in users_data],
+        total=len(users_data),
+        page=1,
+        per_page=10,
+    )
+# dictを返すと、response_modelの検証でユーザー1件ごとにUserResponseの検証が走る（件数に比例して遅くなる）
+# 信頼できるデータ（DBの行など）は model_construct で検証なしにモデルを作成して返す
+## 返り値が既にUserListのインスタンスなので、response_modelの検証はisinstanceの確認だけで済む
+## model_construct は値を検証しないため、外部からの入力には使用しないこと
 
 # プロフィール情報のみ（最小限の情報）
 @app.get("/users/{user_id}/profile", response_model=UserResponse, response_model_exclude={"email", "is_active", "created_at"})
@@ -237,4 +249,14 @@ async def get_user_profile(user_id: int) -> Any:
         "is_active": True,  # 除外される
         "created_at": "2024-01-01T00:00:00Z"  # 除外される
     }
-# 応答: {"id": 1, "username": "john_doe", "full_name": "John Doe"}
\ No newline at end of file
+# 応答: {"id": 1, "username": "john_doe", "full_name": "John Doe"}
+
+# --------------------------------------------------
+# OpenAPIスキーマの事前生成
+## スキーマは最初に /docs（/openapi.json）へアクセスされた時に生成され、app.openapi_schema に保存される
+## このファイルのようにレスポンスモデルが多いと、その最初のアクセスだけ数十ms遅くなる
+## すべてのルートを登録し終えたモジュールの最後で1回呼び出しておくと、起動時に生成が済む
+## 標準の /openapi.json は保存済みのスキーマを再利用するため、/docs, /redoc, /docs/oauth2-redirect や
+## プロキシ配下（root_path）への対応など、FastAPI標準のドキュメント機能はそのまま使える
+# --------------------------------------------------
+app.openapi()
@@ -1,6 +1,6 @@
-from typing import Union, List, Dict
+from typing import Annotated, Literal, Union, List, Dict
 from fastapi import FastAPI
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, WithJsonSchema
 
 app = FastAPI()
 
@@ -14,23 +14,26 @@ app = FastAPI()
 # --------------------------------------------------
 
 # 1. 複数モデルパターンの基本例
+# 応答用のメールアドレス型（理由は17章の _ResponseEmail を参照）
+_ResponseEmail = Annotated[str, WithJsonSchema({"type": "string", "format": "email"})]
+
 class UserIn(BaseModel):
     username: str
     password: str  # 平文パスワード（入力時のみ）
     email: EmailStr
-    full_name: Union[str, None] = None
+    full_name: str | None = None
 
 class UserOut(BaseModel):
     username: str
-    email: EmailStr
-    full_name: Union[str, None] = None
+    email: _ResponseEmail  # 出力専用なので再検証しない
+    full_name: str | None = None
     # password フィールドなし → セキュリティのため
 
 class UserInDB(BaseModel):
     username: str
     hashed_password: str  # ハッシュ化されたパスワード
     email: EmailStr
-    full_name: Union[str, None] = None
+    full_name: str | None = None
 
 # パスワードハッシュ化の偽関数（実際の実装では適切なハッシュライブラリを使用）
 def fake_password_hasher(raw_password: str):
@@ -39,8 +42,13 @@ def fake_password_hasher(raw_password: str):
 # ユーザー保存の偽関数
 def fake_save_user(user_in: UserIn):
     hashed_password = fake_password_hasher(user_in.password)
-    # **user_in.dict() でPydanticオブジェクトをdictに変換してアンパック
-    user_in_db = UserInDB(**user_in.dict(), hashed_password=hashed_password)
+    # user_in はリクエスト受信時に検証済みなので、model_construct で再検証せずにモデルを作成
+    user_in_db = UserInDB.model_construct(
+        username=user_in.username,
+        email=user_in.email,
+        full_name=user_in.full_name,
+        hashed_password=hashed_password,
+    )
     print("User saved! ..not really")
     return user_in_db
 
@@ -49,15 +57,18 @@ async def create_user(user_in: UserIn):
     user_saved = fake_save_user(user_in)
     return user_saved
 # 入力にはパスワードが含まれるが、出力からは自動的に除外される
+## UserInDB(**user_in.model_dump(), hashed_password=...) と書くこともできるが（下の2.を参照）、
+## 中間のdictを作り、EmailStrなど検証済みの値をもう一度検証することになる
+## model_construct は検証を行わないため、信頼できる（検証済みの）値にだけ使用すること
 
 
 # --------------------------------------------------
 # Pydanticモデルの変換テクニック
-## .dict() メソッド：PydanticオブジェクトをPython辞書に変換
+## .model_dump() メソッド：PydanticオブジェクトをPython辞書に変換（Pydantic v1の .dict()）
 ## ** アンパック：辞書をキーワード引数として展開
 # --------------------------------------------------
 
-# 2. .dict()メソッドとアンパックの詳細例
+# 2. .model_dump()メソッドとアンパックの詳細例
 def demonstrate_dict_unpacking():
     # Pydanticオブジェクトの作成
     user_in = UserIn(
@@ -66,8 +77,8 @@ def demonstrate_dict_unpacking():
         email="john.doe@example.com"
     )
     
-    # .dict()でPython辞書に変換
-    user_dict = user_in.dict()
+    # .model_dump()でPython辞書に変換
+    user_dict = user_in.model_dump()
     # 結果: {'username': 'john', 'password': 'secret', 'email': 'john.doe@example.com', 'full_name': None}
     
     # **でアンパックして新しいモデル作成
@@ -81,7 +92,7 @@ def demonstrate_dict_unpacking():
     
     # 追加フィールドと組み合わせ
     hashed_password = fake_password_hasher(user_in.password)
-    user_in_db = UserInDB(**user_in.dict(), hashed_password=hashed_password)
+    user_in_db = UserInDB(**user_dict, hashed_password=hashed_password)
     
     return user_in_db
 
@@ -97,7 +108,7 @@ class UserBase(BaseModel):
     """ユーザーの共通フィールドを定義する基底クラス"""
     username: str
     email: EmailStr
-    full_name: Union[str, None] = None
+    full_name: str | None = None
 
 class UserInImproved(UserBase):
     """入力用モデル - パスワード追加"""
@@ -115,15 +126,20 @@ class UserInDBImproved(UserBase):
 @app.post("/user-improved/", response_model=UserOutImproved)
 async def create_user_improved(user_in: UserInImproved):
     hashed_password = fake_password_hasher(user_in.password)
-    user_in_db = UserInDBImproved(**user_in.dict(), hashed_password=hashed_password)
+    user_in_db = UserInDBImproved.model_construct(
+        username=user_in.username,
+        email=user_in.email,
+        full_name=user_in.full_name,
+        hashed_password=hashed_password,
+    )
     print("User saved with improved models!")
     return user_in_db
 
 
 # --------------------------------------------------
 # Union型 - 複数の型を許可する応答
-## OpenAPIでは anyOf として表現される
-## より具体的な型を先に、より一般的な型を後に配置
+## 判別用のフィールド（discriminator）がない場合、OpenAPIでは anyOf として表現される
+## その場合は、より具体的な型を先に、より一般的な型を後に配置
 # --------------------------------------------------
 
 # 4. Union型を使った複数タイプ応答
@@ -132,10 +148,10 @@ class BaseItem(BaseModel):
     type: str
 
 class CarItem(BaseItem):
-    type: str = "car"  # デフォルト値で型を固定
+    type: Literal["car"] = "car"  # Literalで値を固定
 
 class PlaneItem(BaseItem):
-    type: str = "plane"
+    type: Literal["plane"] = "plane"
     size: int  # 飛行機特有のフィールド
 
 # テストデータ
@@ -148,10 +164,16 @@ items_data = {
     },
 }
 
-@app.get("/items/{item_id}", response_model=Union[PlaneItem, CarItem])
+@app.get(
+    "/items/{item_id}",
+    response_model=Annotated[Union[PlaneItem, CarItem], Field(discriminator="type")],
+)
 async def read_item(item_id: str):
     return items_data[item_id]
-# 注意：より具体的なPlaneItemを先に配置
+# Field(discriminator="type") で判別共用体（discriminated union）にする
+## typeの値を見て、検証に使うモデルを直接選択する
+## discriminatorがない場合は各モデルを順に試して検証するため、型が増えるほど遅くなる
+## OpenAPIでは oneOf + discriminator として表現される
 
 
 # --------------------------------------------------
@@ -204,7 +226,7 @@ async def read_keyword_weights_modern():
 class ProductBase(BaseModel):
     """商品の共通フィールド"""
     name: str
-    description: Union[str, None] = None
+    description: str | None = None
     price: float
 
 class ProductCreate(ProductBase):
@@ -231,8 +253,13 @@ async def create_product(product: ProductCreate):
     # 実際の実装では利益率計算やDB保存を行う
     profit_margin = (product.price - product.cost) / product.cost * 100
     
-    product_internal = ProductInternal(
-        **product.dict(),
+    # product は検証済みなので model_construct で再検証を省略
+    product_internal = ProductInternal.model_construct(
+        name=product.name,
+        description=product.description,
+        price=product.price,
+        cost=product.cost,
+        supplier_id=product.supplier_id,
         id=1,
         profit_margin=profit_margin,
         is_available=True
@@ -285,27 +312,26 @@ async def get_product_public(product_id: int):
 class UserProfile(BaseModel):
     """ユーザープロフィール基底クラス"""
     username: str
-    email: EmailStr
+    email: _ResponseEmail  # 応答専用のモデルなので再検証しない
     created_at: str
 
 class PublicProfile(UserProfile):
     """公開プロフィール"""
-    bio: Union[str, None] = None
+    bio: str | None = None
 
-class PrivateProfile(UserProfile):
+class PrivateProfile(PublicProfile):
     """プライベートプロフィール（本人のみ）"""
-    bio: Union[str, None] = None
-    phone: Union[str, None] = None
-    address: Union[str, None] = None
+    phone: str | None = None
+    address: str | None = None
 
-class AdminProfile(UserProfile):
+class AdminProfile(PrivateProfile):
     """管理者用プロフィール（全情報）"""
-    bio: Union[str, None] = None
-    phone: Union[str, None] = None
-    address: Union[str, None] = None
-    last_login: Union[str, None] = None
+    last_login: str | None = None
     is_verified: bool = False
     account_status: str = "active"
+# 公開 → プライベート → 管理者 の順に継承し、同じフィールドを何度も定義しない
+## 1つのモデル + response_model_include でも出し分けできるが、
+## その場合OpenAPIのスキーマには全フィールドが表示されてしまう（includeはスキーマに反映されない）
 
 # 条件に応じて異なるプロフィール情報を返す例
 @app.get("/profiles/{user_id}/public", response_model=PublicProfile)
@@ -1,6 +1,8 @@
+import re
+import secrets
 from typing import Annotated, Union
 from fastapi import FastAPI, Form, HTTPException, status
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel
 
 app = FastAPI()
 
@@ -15,6 +17,22 @@ app = FastAPI()
 ## 注意：python-multipart のインストールが必要
 # --------------------------------------------------
 
+# 簡単なメール形式チェック用の正規表現（モジュール読み込み時に1回だけコンパイル）
+## EmailStrはオプションのemail-validatorパッケージが必要で、1回あたりの検証もこの正規表現より遅いため、ここでは使わない
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+# 認証情報の比較
+## == は最初に異なる文字が見つかった時点で終了するため、応答時間から正解を推測される（タイミング攻撃）
+## secrets.compare_digest は内容に関係なく一定時間で比較する
+def _secret_matches(value: str, correct: bytes) -> bool:
+    return secrets.compare_digest(value.encode("utf8"), correct)
+
+def _credentials_match(username: str, password: str, correct_username: bytes, correct_password: bytes) -> bool:
+    is_correct_username = _secret_matches(username, correct_username)
+    is_correct_password = _secret_matches(password, correct_password)
+    # 両方を比較してから判定する（ユーザー名が違っても、パスワードの比較を省略しない）
+    return is_correct_username and is_correct_password
+
 # 1. 基本的なフォームデータの使用
 @app.post("/login/")
 async def login(
@@ -26,7 +44,7 @@ async def login(
     Content-Type: application/x-www-form-urlencoded
     """
     # 実際の実装では認証処理を行う
-    if username == "admin" and password == "secret":
+    if _credentials_match(username, password, b"admin", b"secret"):
         return {"message": "Login successful", "username": username}
     else:
         raise HTTPException(
@@ -44,7 +62,7 @@ async def login(
 @app.post("/register/")
 async def register(
     username: Annotated[str, Form(min_length=3, max_length=20)],
-    email: Annotated[str, Form()],  # EmailStrは直接使用できないため、手動検証
+    email: Annotated[str, Form()],  # EmailStrは使わず、_EMAIL_RE で手動検証（理由は _EMAIL_RE の説明を参照）
     password: Annotated[str, Form(min_length=8)],
     full_name: Annotated[Union[str, None], Form()] = None,
     age: Annotated[Union[int, None], Form(ge=18, le=120)] = None
@@ -56,7 +74,7 @@ async def register(
     - age: 18-120歳（オプション）
     """
     # 簡単なメール形式チェック
-    if "@" not in email or "." not in email:
+    if not _EMAIL_RE.fullmatch(email):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Invalid email format"
@@ -95,7 +113,7 @@ async def login_for_access_token(
     # 2. JWTトークン生成
     # 3. トークン返却
     
-    if username == "testuser" and password == "testpass":
+    if _credentials_match(username, password, b"testuser", b"testpass"):
         return {
             "access_token": "fake-jwt-token",
             "token_type": "bearer",
@@ -180,8 +198,10 @@ async def login_with_structured_response(
     構造化されたレスポンスを返すログインエンドポイント
     """
     # 実際の実装では認証とユーザー情報取得
-    if username == "john" and password == "secret123":
-        return LoginResponse(
+    if _credentials_match(username, password, b"john", b"secret123"):
+        # 値はすべてこの関数内で決まっているため、model_construct() で検証を省略して作成する
+        ## 返されたLoginResponseのインスタンスは response_model の検証でも再検証されない
+        return LoginResponse.model_construct(
             message="Login successful",
             username=username,
             user_id=1,
@@ -212,7 +232,7 @@ async def update_profile(
     パスワード変更時の確認処理を含む
     """
     # 現在のパスワード確認
-    if current_password != "current_secret":
+    if not _secret_matches(current_password, b"current_secret"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect"
@@ -347,5 +367,8 @@ async def json_only_data(user_data: UserData):
     """
     return {
         "message": "Data received via JSON",
-        "data": user_data.dict()
-    }
\ No newline at end of file
+        "data": user_data.model_dump()
+    }
+
+# OpenAPIスキーマの事前生成（理由は17章末尾の説明を参照）
+app.openapi()
@@ -1,6 +1,9 @@
-from typing import Annotated, Union
+import json
+import re
+import secrets
+from typing import Annotated, Literal, Union
 from fastapi import FastAPI, Form, HTTPException, status
-from pydantic import BaseModel, Field, validator
+from pydantic import AfterValidator, BaseModel, Field, validator
 from datetime import datetime
 
 app = FastAPI()
@@ -18,6 +21,12 @@ app = FastAPI()
 ## 注意：python-multipart のインストールが必要
 # --------------------------------------------------
 
+# 認証情報の比較（一定時間で比較する理由は20章の _credentials_match を参照）
+def _credentials_match(username: str, password: str, correct_username: bytes, correct_password: bytes) -> bool:
+    is_correct_username = secrets.compare_digest(username.encode("utf8"), correct_username)
+    is_correct_password = secrets.compare_digest(password.encode("utf8"), correct_password)
+    return is_correct_username and is_correct_password
+
 # 1. 基本的なフォームモデルの使用
 class LoginForm(BaseModel):
     username: str
@@ -30,7 +39,7 @@ async def login(data: Annotated[LoginForm, Form()]):
     従来の個別Form()パラメータの代わりにモデル全体をフォームとして受信
     """
     # 実際の実装では認証処理
-    if data.username == "admin" and data.password == "secret":
+    if _credentials_match(data.username, data.password, b"admin", b"secret"):
         return {
             "message": "Login successful",
             "username": data.username,
@@ -67,23 +76,30 @@ async def login_new_style(data: Annotated[LoginForm, Form()]):
 # バリデーション付きフォームモデル
 # --------------------------------------------------
 
+# 複数のフォームモデルで使うメールアドレスの検証
+## 「@の前後に文字があり、@の後ろに.を含む」を1つの正規表現で確認する
+## EmailStrを使わず正規表現で確認する理由は20章の _EMAIL_RE を参照
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+def _check_email(v: str) -> str:
+    """簡単なメール形式チェック"""
+    if not _EMAIL_RE.fullmatch(v):
+        raise ValueError('Invalid email format')
+    return v
+
+## モデルごとに同じ@validatorを書く代わりに、検証付きの型として1回だけ定義して再利用する
+_FormEmail = Annotated[str, AfterValidator(_check_email)]
+
 # 2. 高度なバリデーション機能を持つフォームモデル
 class UserRegistrationForm(BaseModel):
     username: str = Field(min_length=3, max_length=20, description="ユーザー名（3-20文字）")
-    email: str = Field(description="メールアドレス")
+    email: _FormEmail = Field(description="メールアドレス")
     password: str = Field(min_length=8, description="パスワード（8文字以上）")
     confirm_password: str = Field(description="パスワード確認")
     full_name: Union[str, None] = Field(None, max_length=100, description="フルネーム（オプション）")
     age: Union[int, None] = Field(None, ge=18, le=120, description="年齢（18-120歳、オプション）")
     newsletter: bool = Field(False, description="ニュースレター購読")
     
-    @validator('email')
-    def validate_email(cls, v):
-        """簡単なメール形式チェック"""
-        if "@" not in v or "." not in v:
-            raise ValueError('Invalid email format')
-        return v
-    
     @validator('confirm_password')
     def passwords_match(cls, v, values):
         """パスワード確認"""
@@ -148,18 +164,12 @@ async def strict_login(data: Annotated[StrictLoginForm, Form()]):
 # 4. 商品レビューフォームモデル
 class ProductReviewForm(BaseModel):
     reviewer_name: str = Field(min_length=1, max_length=100)
-    reviewer_email: str = Field(description="レビュアーのメールアドレス")
+    reviewer_email: _FormEmail = Field(description="レビュアーのメールアドレス")
     rating: int = Field(ge=1, le=5, description="評価（1-5星）")
     title: str = Field(min_length=1, max_length=200, description="レビュータイトル")
     review_text: str = Field(min_length=10, max_length=2000, description="レビュー本文")
     recommend: bool = Field(False, description="この商品を推奨しますか？")
     verified_purchase: bool = Field(False, description="購入確認済み")
-    
-    @validator('reviewer_email')
-    def validate_email(cls, v):
-        if "@" not in v:
-            raise ValueError('Invalid email format')
-        return v
 
 @app.post("/products/{product_id}/reviews/")
 async def submit_review(
@@ -180,7 +190,7 @@ async def submit_review(
         "message": "Review submitted successfully",
         "product_id": product_id,
         "review_id": 12345,
-        "review_data": review.dict()
+        "review_data": review.model_dump()
     }
 
 
@@ -189,6 +199,9 @@ async def submit_review(
 # --------------------------------------------------
 
 # 5. ユーザー設定フォームモデル
+# よく使うタイムゾーン（毎回リストを作らず、モジュール読み込み時に1回だけ作成）
+_COMMON_TIMEZONES = frozenset({"UTC", "JST", "EST", "PST", "GMT"})
+
 class UserSettingsForm(BaseModel):
     display_name: Union[str, None] = Field(None, max_length=50)
     bio: Union[str, None] = Field(None, max_length=500)
@@ -196,20 +209,13 @@ class UserSettingsForm(BaseModel):
     language: str = Field("en", description="言語設定")
     email_notifications: bool = Field(True, description="メール通知")
     push_notifications: bool = Field(True, description="プッシュ通知")
-    privacy_level: str = Field("public", description="プライバシーレベル")
-    
-    @validator('privacy_level')
-    def validate_privacy_level(cls, v):
-        allowed_levels = ["public", "friends", "private"]
-        if v not in allowed_levels:
-            raise ValueError(f'Privacy level must be one of: {allowed_levels}')
-        return v
+    # 許可する値が決まっている場合はLiteralを使用（検証はpydantic-coreで行われ、OpenAPIにはenumとして表示）
+    privacy_level: Literal["public", "friends", "private"] = Field("public", description="プライバシーレベル")
     
     @validator('timezone')
     def validate_timezone(cls, v):
         # 簡単なタイムゾーン検証
-        common_timezones = ["UTC", "JST", "EST", "PST", "GMT"]
-        if v not in common_timezones:
+        if v not in _COMMON_TIMEZONES:
             # 実際の実装ではpytzなどを使用してより厳密に検証
             pass
         return v
@@ -222,7 +228,7 @@ async def update_user_settings(settings: Annotated[UserSettingsForm, Form()]):
     """
     return {
         "message": "Settings updated successfully",
-        "updated_settings": settings.dict(exclude_unset=True)
+        "updated_settings": settings.model_dump(exclude_unset=True)
     }
 
 
@@ -239,9 +245,11 @@ class ProfileUpdateForm(BaseModel):
     
     @validator('website')
     def validate_website(cls, v):
-        if v and not (v.startswith('http://') or v.startswith('https://')):
+        # startswithにタプルを渡すと、複数の接頭辞を1回の呼び出しで判定できる
+        if v and not v.startswith(('http://', 'https://')):
             raise ValueError('Website URL must start with http:// or https://')
         return v
+## HttpUrl型にすると検証は厳密になるが、この簡単なチェックより遅く、値も正規化される（末尾に / が付くなど）
 
 @app.put("/profile/")
 async def update_profile(profile: Annotated[ProfileUpdateForm, Form()]):
@@ -251,7 +259,7 @@ async def update_profile(profile: Annotated[ProfileUpdateForm, Form()]):
     """
     return {
         "message": "Profile updated successfully",
-        "profile_data": profile.dict(exclude_unset=True)
+        "profile_data": profile.model_dump(exclude_unset=True)
     }
 
 
@@ -260,43 +268,46 @@ async def update_profile(profile: Annotated[ProfileUpdateForm, Form()]):
 # --------------------------------------------------
 
 # 7. 動的な設定項目を持つフォーム
+# 設定タイプごとの値チェック
+def _check_number(v: str) -> str:
+    try:
+        float(v)
+    except ValueError:
+        raise ValueError('Config value must be a valid number')
+    return v
+
+_BOOLEAN_STRINGS = frozenset({"true", "false", "1", "0"})
+
+def _check_boolean(v: str) -> str:
+    if v.lower() not in _BOOLEAN_STRINGS:
+        raise ValueError('Config value must be a valid boolean')
+    return v
+
+def _check_json(v: str) -> str:
+    try:
+        json.loads(v)
+    except json.JSONDecodeError:
+        raise ValueError('Config value must be valid JSON')
+    return v
+
+## if/elifを並べる代わりに、タイプ名 → チェック関数 のdictで1回で選択する（"string"はチェックなし）
+_CONFIG_VALUE_CHECKS = {
+    "number": _check_number,
+    "boolean": _check_boolean,
+    "json": _check_json,
+}
+
 class DynamicConfigForm(BaseModel):
     config_name: str = Field(min_length=1, max_length=100)
     config_value: str = Field(min_length=1)
-    config_type: str = Field(description="設定の種類")
+    config_type: Literal["string", "number", "boolean", "json"] = Field(description="設定の種類")
     is_public: bool = Field(False, description="公開設定")
     
-    @validator('config_type')
-    def validate_config_type(cls, v):
-        allowed_types = ["string", "number", "boolean", "json"]
-        if v not in allowed_types:
-            raise ValueError(f'Config type must be one of: {allowed_types}')
-        return v
-    
     @validator('config_value')
     def validate_config_value(cls, v, values):
         """設定タイプに応じた値の検証"""
-        if 'config_type' not in values:
-            return v
-            
-        config_type = values['config_type']
-        
-        if config_type == "number":
-            try:
-                float(v)
-            except ValueError:
-                raise ValueError('Config value must be a valid number')
-        elif config_type == "boolean":
-            if v.lower() not in ["true", "false", "1", "0"]:
-                raise ValueError('Config value must be a valid boolean')
-        elif config_type == "json":
-            import json
-            try:
-                json.loads(v)
-            except json.JSONDecodeError:
-                raise ValueError('Config value must be valid JSON')
-        
-        return v
+        check = _CONFIG_VALUE_CHECKS.get(values.get('config_type'))
+        return check(v) if check else v
 
 @app.post("/config/")
 async def create_config(config: Annotated[DynamicConfigForm, Form()]):
@@ -306,7 +317,7 @@ async def create_config(config: Annotated[DynamicConfigForm, Form()]):
     """
     return {
         "message": "Configuration created successfully",
-        "config": config.dict()
+        "config": config.model_dump()
     }
 
 
@@ -324,17 +335,11 @@ async def create_config(config: Annotated[DynamicConfigForm, Form()]):
 # 8. フォームモデルの利点を示す比較例
 class ContactForm(BaseModel):
     name: str = Field(min_length=1, max_length=100)
-    email: str
+    email: _FormEmail
     subject: str = Field(min_length=1, max_length=200)
     message: str = Field(min_length=10, max_length=1000)
     phone: Union[str, None] = None
     company: Union[str, None] = None
-    
-    @validator('email')
-    def validate_email(cls, v):
-        if "@" not in v or "." not in v:
-            raise ValueError('Invalid email format')
-        return v
 
 # 同じモデルを複数のエンドポイントで再利用
 @app.post("/contact/")
@@ -347,4 +352,7 @@ async def submit_support_request(contact: Annotated[ContactForm, Form()]):
     """サポートリクエスト投稿（同じフォーム構造）"""
     return {"message": "Support request submitted", "ticket_id": 456}
 
-# モデルの再利用により、一貫性のあるAPI設計と保守性を実現
\ No newline at end of file
+# モデルの再利用により、一貫性のあるAPI設計と保守性を実現
+
+# OpenAPIスキーマの事前生成（理由は17章末尾の説明を参照）
+app.openapi()
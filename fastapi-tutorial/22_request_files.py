@@ -1,8 +1,11 @@
 from typing import Annotated, Union, List
 from fastapi import FastAPI, File, UploadFile, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse
+import errno
 import shutil
 import os
+import uuid
 from pathlib import Path
 
 app = FastAPI()
@@ -56,13 +59,12 @@ async def create_upload_file(file: UploadFile):
             detail="No file selected"
         )
     
-    # ファイル内容を読み取り
-    contents = await file.read()
-    
+    # ファイルサイズは file.size で取得できる（内容が必要な場合は await file.read() で読み取る）
+    ## サイズを知るためだけに read() すると、ファイル全体のコピーがメモリ上に作られる
     return {
         "filename": file.filename,
         "content_type": file.content_type,
-        "file_size": len(contents),
+        "file_size": _upload_size(file),
         "message": f"Successfully uploaded {file.filename}"
     }
 
@@ -86,13 +88,12 @@ async def get_file_info(file: UploadFile):
             detail="No file provided"
         )
     
-    # ファイルの先頭に移動
-    await file.seek(0)
-    
     # ファイル内容を読み取り
+    ## ハンドラーが呼ばれた時点でファイル位置は先頭にあるため、読み取り前の seek(0) は不要
     contents = await file.read()
     
-    # 再度先頭に移動（必要に応じて）
+    # 再度先頭に移動
+    ## 同じファイルをこの後もう一度読む場合（保存処理に渡すなど）にだけ必要
     await file.seek(0)
     
     # ファイル情報を詳細に取得
@@ -114,6 +115,29 @@ async def get_file_info(file: UploadFile):
 # 4. ファイルをディスクに保存
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+# ファイルコピー時に1回で読み書きするサイズ（1MB）
+## shutil.copyfileobj の既定値（Linuxでは64KB）より大きくすると、大きなファイルでの読み書き回数が減る
+## 同時アップロード数 × この値 がメモリ使用量の目安になるため、環境に合わせて調整する
+COPY_BUFSIZE = 1 << 20
+
+def _save_upload(upload: UploadFile, dst_path: str) -> None:
+    """アップロードされたファイルを dst_path に書き出す"""
+    src = upload.file
+    with open(dst_path, "wb") as dst:
+        # 大きなファイルはSpooledTemporaryFileがディスク上の一時ファイルに切り替わっている（_rolled）
+        ## その場合は os.sendfile でカーネル内でコピーし、Python側のバッファを経由しない
+        ## メモリ上の小さなファイルや sendfile が使えない環境（Windowsなど）では copyfileobj を使う
+        if getattr(src, "_rolled", False) and hasattr(os, "sendfile"):
+            offset = src.tell()
+            start = offset
+            try:
+                while sent := os.sendfile(dst.fileno(), src.fileno(), offset, COPY_BUFSIZE):
+                    offset += sent
+                return
+            except OSError:
+                if offset != start:  # 途中まで書き込んだ後の失敗はそのままエラーにする
+                    raise
+        shutil.copyfileobj(src, dst, length=COPY_BUFSIZE)
 
 @app.post("/save-file/")
 async def save_file(file: UploadFile):
@@ -137,8 +161,9 @@ async def save_file(file: UploadFile):
     
     try:
         # ファイルを保存
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        ## ディスクへの書き込みは同期処理のため、async def の中で直接呼ぶとイベントループが止まる
+        ## run_in_threadpool でスレッドプールに渡し、保存中も他のリクエストを処理できるようにする
+        await run_in_threadpool(_save_upload, file, file_path)
         
         return {
             "message": "File saved successfully",
@@ -147,10 +172,17 @@ async def save_file(file: UploadFile):
             "file_size": os.path.getsize(file_path)
         }
     
-    except Exception as e:
+    # ファイル書き込みのエラー（OSError）だけを扱い、プログラムの不具合（TypeErrorなど）は隠さない
+    ## str(e) にはサーバー上のパスなどが含まれるため、クライアントへのメッセージには入れない
+    except OSError as e:
+        if e.errno == errno.ENOSPC:  # ディスク容量不足
+            raise HTTPException(
+                status_code=status.HTTP_507_INSUFFICIENT_STORAGE,
+                detail="Insufficient storage"
+            )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save file: {str(e)}"
+            detail="Failed to save file"
         )
 
 
@@ -159,9 +191,36 @@ async def save_file(file: UploadFile):
 # --------------------------------------------------
 
 # 5. 画像ファイルのみ許可する例
-ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/png", "image/gif", "image/webp"]
+# 許可する値の集合（in による判定はリストだと先頭から順に比較、frozensetならハッシュで1回）
+ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/gif", "image/webp"})
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
+# アップロードファイルのサイズ（バイト数）を返す
+## UploadFile.size の型は int | None で、UploadFile を直接生成した場合などは None になる
+## None のときは None > MAX_FILE_SIZE が TypeError（500エラー）になるため、
+## 一時ファイルの末尾まで seek して tell() でサイズを求める（内容はメモリに読み込まない）
+def _upload_size(file: UploadFile) -> int:
+    if file.size is not None:
+        return file.size
+    pos = file.file.tell()
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(pos)
+    return size
+
+# ファイル先頭のバイト列（マジックナンバー）から画像の種類を判定する
+## content_type はクライアントが自由に設定できるため、それだけでは画像である保証にならない
+def _sniff_image(head: bytes) -> str | None:
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
 @app.post("/upload-image/")
 async def upload_image(file: UploadFile):
     """
@@ -181,26 +240,38 @@ async def upload_image(file: UploadFile):
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type {file.content_type} not allowed. Allowed types: {ALLOWED_IMAGE_TYPES}"
+            detail=f"File type {file.content_type} not allowed. Allowed types: {sorted(ALLOWED_IMAGE_TYPES)}"
         )
     
-    # ファイル内容を読み取り
-    contents = await file.read()
+    # ファイル内容のチェック（先頭512バイトだけを読み取る）
+    ## 画像でないファイルは、全体を読み込む前にここで拒否できる
+    head = await file.read(512)
+    await file.seek(0)
+    if _sniff_image(head) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File content is not a supported image"
+        )
     
-    # ファイルサイズチェック
-    if len(contents) > MAX_FILE_SIZE:
+    # ファイルサイズチェック（読み取る前に file.size で確認する）
+    ## 全体を読み込んでから len() で確認すると、大きすぎるファイルも一度メモリに載ってしまう
+    ## ただしハンドラーが呼ばれる時点でリクエスト本体は受信済みのため、
+    ## 受信そのものを制限するにはサーバー/リバースプロキシ側の設定（nginxの client_max_body_size など）を使う
+    file_size = _upload_size(file)
+    if file_size > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File size {len(contents)} exceeds maximum allowed size {MAX_FILE_SIZE}"
+            detail=f"File size {file_size} exceeds maximum allowed size {MAX_FILE_SIZE}"
         )
     
     # 実際の実装では画像処理ライブラリ（Pillow等）で詳細検証
+    ## 内容が必要になるのはその時点なので、ここまでのチェックでは file.read() で全体を読み込まない
     
     return {
         "message": "Image uploaded successfully",
         "filename": file.filename,
         "content_type": file.content_type,
-        "file_size": len(contents)
+        "file_size": file_size
     }
 
 
@@ -215,7 +286,7 @@ async def create_files(files: List[bytes] = File()):
     複数ファイルの同時アップロード（bytes方式）
     小さなファイル群に適している
     """
-    if not files or all(len(file) == 0 for file in files):
+    if not files or not any(files):  # 空のbytesは偽として扱われる
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No files uploaded"
@@ -239,7 +310,7 @@ async def create_upload_files(files: List[UploadFile]):
     複数ファイルの同時アップロード（UploadFile方式）推奨
     大容量ファイル群や混合ファイルタイプに適している
     """
-    if not files or all(not file.filename for file in files):
+    if not files or not any(file.filename for file in files):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No files selected"
@@ -250,8 +321,9 @@ async def create_upload_files(files: List[UploadFile]):
     
     for file in files:
         if file.filename:  # ファイルが選択されている場合のみ処理
-            contents = await file.read()
-            file_size = len(contents)
+            # ファイルサイズは受信時に記録された file.size を使う
+            ## サイズを知るためだけに全ファイルを read() してメモリに読み込む必要はない
+            file_size = _upload_size(file)
             total_size += file_size
             
             file_info_list.append({
@@ -259,9 +331,6 @@ async def create_upload_files(files: List[UploadFile]):
                 "content_type": file.content_type,
                 "file_size": file_size
             })
-            
-            # ファイルポインタを先頭に戻す（必要に応じて）
-            await file.seek(0)
     
     return {
         "files_count": len(file_info_list),
@@ -296,11 +365,18 @@ async def upload_profile_image(user_id: int, file: UploadFile):
             detail="Only image files are allowed"
         )
     
-    # ファイル内容読み取り
-    contents = await file.read()
+    # ファイル内容のチェック（upload_image と同様に先頭だけを確認）
+    head = await file.read(512)
+    await file.seek(0)
+    if _sniff_image(head) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only image files are allowed"
+        )
     
-    # ファイルサイズチェック
-    if len(contents) > MAX_FILE_SIZE:
+    # ファイルサイズチェック（読み取る前に確認）
+    file_size = _upload_size(file)
+    if file_size > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail="Image file too large"
@@ -315,7 +391,6 @@ async def upload_profile_image(user_id: int, file: UploadFile):
     # 6. データベース更新
     
     # ユニークなファイル名生成（簡単な例）
-    import uuid
     file_extension = Path(file.filename).suffix
     unique_filename = f"profile_{user_id}_{uuid.uuid4()}{file_extension}"
     
@@ -324,7 +399,7 @@ async def upload_profile_image(user_id: int, file: UploadFile):
         "user_id": user_id,
         "filename": unique_filename,
         "content_type": file.content_type,
-        "file_size": len(contents),
+        "file_size": file_size,
         "image_url": f"/static/profiles/{unique_filename}"  # 実際のURL
     }
 
@@ -334,13 +409,7 @@ async def upload_profile_image(user_id: int, file: UploadFile):
 # --------------------------------------------------
 
 # 9. ファイルアップロードテスト用のHTMLページ
-@app.get("/", response_class=HTMLResponse)
-async def upload_form():
-    """
-    ファイルアップロードテスト用のHTMLフォーム
-    開発・テスト時に便利
-    """
-    content = """
+_UPLOAD_FORM_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -397,7 +466,15 @@ async def upload_form():
     </body>
     </html>
     """
-    return HTMLResponse(content=content)
+
+@app.get("/", response_class=HTMLResponse)
+async def upload_form():
+    """
+    ファイルアップロードテスト用のHTMLフォーム
+    開発・テスト時に便利
+    """
+    # 共有するのはHTMLの文字列だけで、Responseは毎回作る（理由は19章の get_users の説明を参照）
+    return HTMLResponse(content=_UPLOAD_FORM_HTML)
 
 
 # --------------------------------------------------
@@ -413,6 +490,9 @@ async def upload_form():
 
 
 # 10. エラーハンドリングの例
+## 許可する拡張子はリクエストごとに作り直さないよう、モジュールレベルの定数にする
+ALLOWED_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".pdf", ".txt", ".docx"})
+
 @app.post("/secure-upload/")
 async def secure_file_upload(file: UploadFile):
     """
@@ -428,20 +508,17 @@ async def secure_file_upload(file: UploadFile):
             )
         
         # ファイル拡張子チェック
-        allowed_extensions = {".jpg", ".jpeg", ".png", ".gif", ".pdf", ".txt", ".docx"}
         file_extension = Path(file.filename).suffix.lower()
         
-        if file_extension not in allowed_extensions:
+        if file_extension not in ALLOWED_EXTENSIONS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"File extension {file_extension} not allowed"
             )
         
-        # ファイル内容読み取り
-        contents = await file.read()
-        
-        # 空ファイルチェック
-        if len(contents) == 0:
+        # 空ファイルチェック（サイズのチェックは読み取る前に file.size で行う）
+        file_size = _upload_size(file)
+        if file_size == 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Empty file not allowed"
@@ -449,7 +526,7 @@ async def secure_file_upload(file: UploadFile):
         
         # ファイルサイズチェック
         max_size = 10 * 1024 * 1024  # 10MB
-        if len(contents) > max_size:
+        if file_size > max_size:
             raise HTTPException(
                 status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                 detail=f"File size exceeds {max_size} bytes"
@@ -465,7 +542,7 @@ async def secure_file_upload(file: UploadFile):
             "message": "File uploaded securely",
             "filename": file.filename,
             "content_type": file.content_type,
-            "file_size": len(contents),
+            "file_size": file_size,
             "file_extension": file_extension
         }
         
@@ -20,6 +20,17 @@ app = FastAPI()
 ## 注意：python-multipart のインストールが必要
 # --------------------------------------------------
 
+# アップロードファイルのサイズ（バイト数）を返す
+## UploadFile.size は int | None なので、None の場合は一時ファイルを seek/tell して求める（22章と同じ方法）
+def _upload_size(file: UploadFile) -> int:
+    if file.size is not None:
+        return file.size
+    pos = file.file.tell()
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(pos)
+    return size
+
 # 1. 基本的なフォーム + ファイルの組み合わせ
 @app.post("/files/")
 async def create_file(
@@ -83,11 +94,11 @@ async def update_user_profile(
                 detail="Profile image must be an image file"
             )
         
-        contents = await profile_image.read()
+        # サイズだけが必要なので、read() せずに profile_image.size を使う
         uploaded_images["profile_image"] = {
             "filename": profile_image.filename,
             "content_type": profile_image.content_type,
-            "size": len(contents)
+            "size": _upload_size(profile_image)
         }
     
     if cover_image and cover_image.filename:
@@ -98,11 +109,10 @@ async def update_user_profile(
                 detail="Cover image must be an image file"
             )
         
-        contents = await cover_image.read()
         uploaded_images["cover_image"] = {
             "filename": cover_image.filename,
             "content_type": cover_image.content_type,
-            "size": len(contents)
+            "size": _upload_size(cover_image)
         }
     
     return {
@@ -168,12 +178,12 @@ async def create_product(
                     detail=f"File {image.filename} is not an image"
                 )
             
-            contents = await image.read()
+            # サイズは受信時に記録された image.size を使う（read() で全体をメモリに読み込まない）
             processed_images.append({
                 "order": i + 1,
                 "filename": image.filename,
                 "content_type": image.content_type,
-                "size": len(contents)
+                "size": _upload_size(image)
             })
     
     # マニュアル処理
@@ -186,11 +196,10 @@ async def create_product(
                 detail="Manual must be a PDF file"
             )
         
-        contents = await manual.read()
         manual_info = {
             "filename": manual.filename,
             "content_type": manual.content_type,
-            "size": len(contents)
+            "size": _upload_size(manual)
         }
     
     return {
@@ -246,22 +255,21 @@ async def create_blog_post(
                 detail="Featured image must be an image file"
             )
         
-        contents = await featured_image.read()
         featured_image_info = {
             "filename": featured_image.filename,
             "content_type": featured_image.content_type,
-            "size": len(contents)
+            "size": _upload_size(featured_image)
         }
     
     # 添付ファイル処理
     processed_attachments = []
     for attachment in attachments:
         if attachment.filename:
-            contents = await attachment.read()
-            
             # ファイルサイズ制限（例：10MB）
+            ## 内容を読み込む前に attachment.size（None の場合は _upload_size() の seek/tell）で判定する
             max_size = 10 * 1024 * 1024
-            if len(contents) > max_size:
+            attachment_size = _upload_size(attachment)
+            if attachment_size > max_size:
                 raise HTTPException(
                     status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                     detail=f"File {attachment.filename} exceeds size limit"
@@ -270,7 +278,7 @@ async def create_blog_post(
             processed_attachments.append({
                 "filename": attachment.filename,
                 "content_type": attachment.content_type,
-                "size": len(contents)
+                "size": attachment_size
             })
     
     return {
@@ -287,6 +295,13 @@ async def create_blog_post(
 # --------------------------------------------------
 
 # 5. 求人応募フォーム（個人情報 + 履歴書 + ポートフォリオ）
+## 履歴書として許可するファイルタイプ（リクエストごとに作り直さないよう、モジュールレベルのfrozensetにする）
+ALLOWED_RESUME_TYPES = frozenset({
+    "application/pdf",
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+})
+
 @app.post("/jobs/{job_id}/applications/")
 async def submit_job_application(
     job_id: int,
@@ -321,9 +336,7 @@ async def submit_job_application(
         )
     
     # 履歴書ファイルタイプチェック
-    allowed_resume_types = ["application/pdf", "application/msword", 
-                           "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
-    if resume.content_type not in allowed_resume_types:
+    if resume.content_type not in ALLOWED_RESUME_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Resume must be PDF or Word document"
@@ -341,33 +354,30 @@ async def submit_job_application(
         "cover_letter": cover_letter
     }
     
-    # 履歴書処理
-    resume_contents = await resume.read()
+    # 履歴書処理（サイズは resume.size から取得し、ファイル全体は読み込まない）
     resume_info = {
         "filename": resume.filename,
         "content_type": resume.content_type,
-        "size": len(resume_contents)
+        "size": _upload_size(resume)
     }
     
     # ポートフォリオ処理
     portfolio_info = None
     if portfolio and portfolio.filename:
-        portfolio_contents = await portfolio.read()
         portfolio_info = {
             "filename": portfolio.filename,
             "content_type": portfolio.content_type,
-            "size": len(portfolio_contents)
+            "size": _upload_size(portfolio)
         }
     
     # 資格証明書処理
     processed_certificates = []
     for cert in certificates:
         if cert.filename:
-            cert_contents = await cert.read()
             processed_certificates.append({
                 "filename": cert.filename,
                 "content_type": cert.content_type,
-                "size": len(cert_contents)
+                "size": _upload_size(cert)
             })
     
     return {
@@ -385,12 +395,7 @@ async def submit_job_application(
 # --------------------------------------------------
 
 # 6. フォーム + ファイルテスト用のHTMLページ
-@app.get("/", response_class=HTMLResponse)
-async def form_and_file_test():
-    """
-    フォーム + ファイル同時送信テスト用のHTMLページ
-    """
-    content = """
+_FORM_TEST_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -499,7 +504,14 @@ async def form_and_file_test():
     </body>
     </html>
     """
-    return HTMLResponse(content=content)
+
+@app.get("/", response_class=HTMLResponse)
+async def form_and_file_test():
+    """
+    フォーム + ファイル同時送信テスト用のHTMLページ
+    """
+    # 共有するのはHTMLの文字列だけで、Responseは毎回作る（理由は19章の get_users の説明を参照）
+    return HTMLResponse(content=_FORM_TEST_HTML)
 
 
 # --------------------------------------------------
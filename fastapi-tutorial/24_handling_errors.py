@@ -1,3 +1,4 @@
+import os
 from typing import Annotated, Union
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.responses import JSONResponse, PlainTextResponse
@@ -12,6 +13,9 @@ from pydantic import BaseModel
 
 app = FastAPI()
 
+# 開発モード（DEBUG=1 のとき、検証エラーのレスポンスにリクエストボディを含める）
+DEBUG = os.getenv("DEBUG") == "1"
+
 # --------------------------------------------------
 # エラーハンドリング（Handling Errors）
 ## API使用中に発生する様々なエラー状況をクライアントに適切に通知する機能
@@ -208,7 +212,9 @@ async def business_operation(value: int):
 # --------------------------------------------------
 
 # 6. リクエスト検証エラーのカスタムハンドラー
-@app.exception_handler(RequestValidationError)
+## 1つの例外クラスに登録できるハンドラーは1つだけで、同じ例外に何度も登録すると最後に登録したものだけが有効になる
+## このファイルでは 6〜8 の書き方を関数として示し、実際の登録は 9 でまとめて行う
+## 6〜8 のハンドラーを使う場合は、9 の代わりに @app.exception_handler(...) を付けて登録する
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """
     リクエスト検証エラーのカスタムハンドラー
@@ -223,7 +229,6 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     return PlainTextResponse(message, status_code=400)
 
 # 7. HTTPException ハンドラーのオーバーライド
-@app.exception_handler(StarletteHTTPException)
 async def http_exception_handler_override(request: Request, exc: StarletteHTTPException):
     """
     HTTPExceptionハンドラーのオーバーライド
@@ -242,7 +247,6 @@ class Item(BaseModel):
     size: int
 
 # 別のバリデーションエラーハンドラー（リクエストボディ付き）
-@app.exception_handler(RequestValidationError)
 async def validation_exception_handler_with_body(request: Request, exc: RequestValidationError):
     """
     リクエストボディを含む検証エラーハンドラー
@@ -269,6 +273,7 @@ async def create_item(item: Item):
 # --------------------------------------------------
 
 # 9. デフォルト例外ハンドラーの再利用
+## StarletteHTTPException と RequestValidationError に対して実際に登録するハンドラー
 @app.exception_handler(StarletteHTTPException)
 async def custom_http_exception_handler(request: Request, exc: StarletteHTTPException):
     """
@@ -289,6 +294,10 @@ async def validation_exception_handler_with_logging(request: Request, exc: Reque
     print(f"OMG! The client sent invalid data!: {exc}")
     # ここで詳細なログ記録、エラー分析などを実行
     
+    # 開発時（環境変数 DEBUG=1）は、受信したボディも含めて返す（8のハンドラー）
+    if DEBUG:
+        return await validation_exception_handler_with_body(request, exc)
+    
     # デフォルトハンドラーを呼び出し
     return await request_validation_exception_handler(request, exc)
 